@@ -3,7 +3,8 @@ from __future__ import annotations
 
 import logging
 import os
-from typing import Any, Dict
+import threading
+from typing import Any, Dict, Optional
 
 import webview
 
@@ -18,9 +19,14 @@ class Api:
     Méthodes appelables depuis JS:
     await window.pywebview.api.method(...)
     """
+    TAGS_SAVE_DELAY_S = 0.5
+
     def __init__(self, mgr: MassiqueManager):
         self.mgr = mgr
         self.settings = load_settings()
+        # tags en cache : pas de relecture disque à chaque édition UI
+        self.tags = load_tags()
+        self._tags_timer: Optional[threading.Timer] = None
 
     # --- app / ui ---
     def get_app_info(self) -> Dict[str, Any]:
@@ -47,12 +53,20 @@ class Api:
     def snapshot(self) -> Dict[str, Any]:
         return self.mgr.snapshot()
 
+    def get_shm_info(self) -> Dict[str, Any]:
+        # pour un client natif : lecture directe des métriques sans JSON
+        return self.mgr.shm_info()
+
     def set_tag(self, idx: int, tag: str) -> bool:
-        tags = load_tags()
         tag8 = str(tag)[:8].ljust(8, "_")
-        tags[idx] = tag8
-        save_tags(tags)
+        self.tags[idx] = tag8
         self.mgr.set_tag(idx, tag8)
+        # sauvegarde différée : une seule écriture disque par rafale d'éditions
+        if self._tags_timer:
+            self._tags_timer.cancel()
+        self._tags_timer = threading.Timer(self.TAGS_SAVE_DELAY_S, save_tags, args=(list(self.tags),))
+        self._tags_timer.daemon = True
+        self._tags_timer.start()
         return True
 
     def toggle_device(self, idx: int, on: bool) -> Dict[str, Any]:
@@ -82,6 +96,13 @@ class Api:
         self.mgr.select_gas(idx, gas_name)
         return self.mgr.snapshot()
 
+    def close(self) -> None:
+        """Flush de la sauvegarde différée des tags (fin d'application)."""
+        if self._tags_timer:
+            self._tags_timer.cancel()
+            self._tags_timer = None
+        save_tags(list(self.tags))
+
 
 def main():
     tags = load_tags()
@@ -103,6 +124,9 @@ def main():
 
     webview.start(debug=False)  # debug=True => console dev + reload plus simple
 
+    api.close()  # tags en attente de sauvegarde
+    mgr.close()  # port série + mémoire partagée
+
 
 if __name__ == "__main__":
     main()
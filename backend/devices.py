@@ -1,31 +1,60 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-import datetime
+import array
+import functools
+import itertools
 import logging
+import sys
 import threading
 import time
 from dataclasses import dataclass, field
+from multiprocessing import shared_memory
 from typing import Any, Dict, List, Optional, Tuple
 
 import serial
 import serial.tools.list_ports
 from sprotocol import device  # ton driver Brooks
 
+from settings import DEFAULT_TAGS
+
 log = logging.getLogger(__name__)
 
+# actions vanne -> code protocole (constant, construit une fois à l'import)
+_VANNE_ACTIONS = {"Ouverture": 1, "Fermeture": 2, "Régulation": 0}
+
 
 def list_com_ports() -> list[str]:
+    if sys.platform == "win32":
+        # lecture directe du registre (~1ms) au lieu de l'énumération
+        # SetupAPI/WMI de list_ports (100-500ms à chaque ouverture du menu)
+        import winreg
+
+        ports: list[str] = []
+        try:
+            key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"HARDWARE\DEVICEMAP\SERIALCOMM")
+        except OSError:
+            return ports
+        with key:
+            for i in itertools.count():
+                try:
+                    _, port, _ = winreg.EnumValue(key, i)
+                except OSError:
+                    break
+                ports.append(port)
+        return ports
     return [p.device for p in serial.tools.list_ports.comports()]
 
 
 def open_serial_port(port: str) -> serial.Serial:
     # reprend tes réglages (19200, ODD, 8N1 stopbits 1)
+    # timeouts courts : un device muet coûte 0.2s par lecture, pas 1s
     try:
         return serial.Serial(
             port,
             baudrate=19200,
-            timeout=1,
+            timeout=0.2,
+            write_timeout=0.2,
             parity=serial.PARITY_ODD,
             stopbits=serial.STOPBITS_ONE,
             bytesize=serial.EIGHTBITS,
@@ -34,60 +63,208 @@ def open_serial_port(port: str) -> serial.Serial:
         raise RuntimeError(f"Impossible d'ouvrir le port série {port}: {e}") from e
 
 
+@functools.lru_cache(maxsize=64)
 def pack_tag_name(tag: str) -> bytes:
-    # repris de ton code
-    tag = tag[:8].ljust(8, "_")
-    packed = bytearray()
-    for i in range(0, 8, 4):
-        c = [ord(ch) & 0x3F for ch in tag[i : i + 4]]
-        packed.extend([
-            (c[0] << 2) | (c[1] >> 4),
-            ((c[1] & 0x0F) << 4) | (c[2] >> 2),
-            ((c[2] & 0x03) << 6) | c[3],
-        ])
-    return bytes(packed)
-
-
-@dataclass
+    # 8 chars ASCII -> 8 lanes de 6 bits -> 6 octets, en une seule
+    # expression 64 bits (pas de boucle Python par caractère)
+    # latin-1 : les accents saisis dans l'UI sont masqués par & 0x3F
+    # comme le faisait ord(ch) & 0x3F, au lieu de lever UnicodeEncodeError
+    b = tag[:8].ljust(8, "_").encode("latin-1", errors="replace")
+    w = int.from_bytes(b, "big") & 0x3F3F3F3F3F3F3F3F
+    packed = (
+        ((w >> 56) & 0x3F) << 42
+        | ((w >> 48) & 0x3F) << 36
+        | ((w >> 40) & 0x3F) << 30
+        | ((w >> 32) & 0x3F) << 24
+        | ((w >> 24) & 0x3F) << 18
+        | ((w >> 16) & 0x3F) << 12
+        | ((w >> 8) & 0x3F) << 6
+        | (w & 0x3F)
+    )
+    return packed.to_bytes(6, "big")
+
+
+class _HistoryRing:
+    """
+    Ring buffer struct-of-arrays : deux array.array('d') (valeurs +
+    secondes monotones), sans allocation de tuple par échantillon.
+    """
+
+    __slots__ = ("values", "times", "head", "size", "maxlen")
+
+    def __init__(self, maxlen: int = 3600):
+        self.maxlen = maxlen
+        self.values = array.array("d", bytes(8 * maxlen))
+        self.times = array.array("d", bytes(8 * maxlen))
+        self.head = 0
+        self.size = 0
+
+    def append(self, value: float, t: float) -> None:
+        self.values[self.head] = value
+        self.times[self.head] = t
+        self.head = (self.head + 1) % self.maxlen
+        if self.size < self.maxlen:
+            self.size += 1
+
+    def clear(self) -> None:
+        self.head = 0
+        self.size = 0
+
+    def as_pairs(self) -> List[Tuple[float, float]]:
+        # du plus ancien au plus récent (pour une future API de courbes)
+        start = (self.head - self.size) % self.maxlen
+        return [
+            (self.values[(start + k) % self.maxlen], self.times[(start + k) % self.maxlen])
+            for k in range(self.size)
+        ]
+
+
+def _as_float(x: Any) -> float:
+    try:
+        return float(x)
+    except Exception:
+        return 0.0
+
+
+class _TieredHistory:
+    """
+    Historique décimé en trois anneaux : pleine résolution sur les 60
+    derniers échantillons, 1 sur 10 pour ~10min, 1 sur 60 pour ~1h.
+    Mémoire ~10x plus petite qu'un anneau unique de 3600 points, perte
+    de précision négligeable pour des courbes UI.
+    """
+
+    __slots__ = ("recent", "medium", "long", "count")
+
+    MEDIUM_EVERY = 10
+    LONG_EVERY = 60
+
+    def __init__(self):
+        self.recent = _HistoryRing(60)
+        self.medium = _HistoryRing(60)
+        self.long = _HistoryRing(60)
+        self.count = 0
+
+    def append(self, value: float, t: float) -> None:
+        self.recent.append(value, t)
+        self.count += 1
+        if self.count % self.MEDIUM_EVERY == 0:
+            self.medium.append(value, t)
+        if self.count % self.LONG_EVERY == 0:
+            self.long.append(value, t)
+
+    def clear(self) -> None:
+        self.recent.clear()
+        self.medium.clear()
+        self.long.clear()
+        self.count = 0
+
+    def as_pairs(self) -> List[Tuple[float, float]]:
+        # du plus ancien au plus récent (l'UI peut dédupliquer par horodatage)
+        return self.long.as_pairs() + self.medium.as_pairs() + self.recent.as_pairs()
+
+
+@dataclass(slots=True)
 class DeviceState:
+    """
+    Champs froids par device (tags, unités, gaz, historiques).
+    Les scalaires chauds (mesure, consigne, FS, total, actif) vivent en
+    tableaux parallèles sur MassiqueManager — voir __init__.
+    """
+
     index: int
     tag: str
 
-    active: bool = False
     selected_gas: Optional[int] = None
+    default_gas_id: Optional[int] = None
     available_gases: List[str] = field(default_factory=list)
     gas_map: Dict[str, int] = field(default_factory=dict)
 
-    consigne: float = 0.0
-    full_scale_value: float = 0.0
-
-    mesure: Tuple[Any, str] = (0, "N/A")
-    temperature: Tuple[Any, str] = (0, "N/A")
-    full_scale: Tuple[Any, str] = (0, "N/A")
-    totalization_value: Tuple[Any, str] = (0, "N/A")
+    mesure_unit: str = "N/A"
+    temperature_unit: str = "N/A"
+    full_scale_unit: str = "N/A"
+    total_unit: str = "N/A"
     valve_command: str = "N/A"
 
     ramp_active: bool = False
     ramp_time_s: float = 1.0
 
-    measurements: List[Tuple[float, datetime.datetime]] = field(default_factory=list)
-    consigne_points: List[Tuple[float, datetime.datetime]] = field(default_factory=list)
+    # True si le driver expose une lecture groupée (une seule transaction bus)
+    has_bulk_read: bool = False
+
+    # seqlock : impair = écriture en cours côté poll, pair = état stable.
+    # Un lecteur relit tant que seq a changé — pas de mutex entre UI et poll.
+    seq: int = 0
+
+    # échéance monotone du prochain poll (déphasée par device pour lisser le bus)
+    next_poll_at: float = 0.0
+
+    # anneaux décimés : 1h d'historique à 1Hz, append O(1) sans recopie
+    measurements: _TieredHistory = field(default_factory=_TieredHistory)
+    consigne_points: _TieredHistory = field(default_factory=_TieredHistory)
 
 
 class MassiqueManager:
+    # lignes de la vue partagée, dans l'ordre (voir get_shm_info côté Api)
+    SHM_METRICS = ("active", "consigne", "full_scale", "mesure", "temperature", "total")
+
     def __init__(self, tags: list[str], max_devices: int = 12):
         self.serial_lock = threading.Lock()
         self.serial_port: Optional[serial.Serial] = None
         self.max_devices = max_devices
 
         self.devices: List[DeviceState] = [
-            DeviceState(index=i, tag=tags[i] if i < len(tags) else f"MFC{i+1:05d}"[:8].ljust(8, "_"))
+            DeviceState(index=i, tag=tags[i] if i < len(tags) else DEFAULT_TAGS[i])
             for i in range(max_devices)
         ]
 
         self._mfc_objs: List[Optional[Any]] = [None] * max_devices
 
-        self._poll_stop = threading.Event()
+        # SoA : scalaires chauds en tableaux parallèles indexés par device,
+        # lus/écrits à chaque poll sans passer par les attributs du dataclass
+        self.active = array.array("b", bytes(max_devices))
+        self.consigne = array.array("d", bytes(8 * max_devices))
+        self.full_scale = array.array("d", bytes(8 * max_devices))
+        self.mesure_val = array.array("d", bytes(8 * max_devices))
+        self.temperature_val = array.array("d", bytes(8 * max_devices))
+        self.total_val = array.array("d", bytes(8 * max_devices))
+
+        # vue zéro-copie pour un client natif : 6 lignes de float64 par
+        # métrique + un compteur de version en dernière case, mise à jour
+        # par _sync_snapshot sans repasser par le JSON du pont JS
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=8 * (len(self.SHM_METRICS) * max_devices + 1)
+        )
+        self._shm_view = memoryview(self._shm.buf).cast("d")
+
+        # snapshot construit une fois puis mis à jour en place (voir _sync_snapshot) :
+        # évite de réallouer ~150 dicts à chaque appel UI
+        self._snapshot: Dict[str, Any] = {
+            "connected": False,
+            "version": 0,
+            "devices": [
+                {
+                    "index": d.index,
+                    "tag": d.tag,
+                    "active": bool(self.active[d.index]),
+                    "consigne": self.consigne[d.index],
+                    "full_scale_value": self.full_scale[d.index],
+                    "mesure": {"value": self.mesure_val[d.index], "unit": d.mesure_unit},
+                    "total": {"value": self.total_val[d.index], "unit": d.total_unit},
+                    "valve": d.valve_command,
+                    "ramp": {"active": d.ramp_active, "time_s": d.ramp_time_s},
+                    # référence partagée : activate() mute la liste en place
+                    "gases": d.available_gases,
+                    "selected_gas": d.selected_gas,
+                }
+                for d in self.devices
+            ],
+        }
+
+        # flag d'arrêt : simple booléen (écriture atomique en CPython),
+        # l'Event ne sert qu'à réveiller le sommeil entre deux passes
+        self._poll_stop_flag = False
+        self._poll_wake = threading.Event()
         self._poll_thread: Optional[threading.Thread] = None
 
     # ---------- Serial ----------
@@ -108,7 +285,8 @@ class MassiqueManager:
         # on désactive tout proprement côté soft
         for i in range(self.max_devices):
             self._mfc_objs[i] = None
-            self.devices[i].active = False
+            self.active[i] = 0
+            self._sync_snapshot(i)
 
     # ---------- Device lifecycle ----------
     def activate(self, idx: int) -> None:
@@ -123,31 +301,35 @@ class MassiqueManager:
             with self.serial_lock:
                 mfc.get_address()
 
-            d.active = True
+            self.active[idx] = 1
+            d.has_bulk_read = callable(getattr(mfc, "read_bulk", None))
             self._mfc_objs[idx] = mfc
 
-            # gaz
+            # gaz — une seule section critique pour toute la découverte
+            # (4 acquisitions de lock en moins par activation)
             d.available_gases.clear()
             d.gas_map.clear()
-            for gaz_id in range(1, 5):
-                try:
-                    with self.serial_lock:
+            d.default_gas_id = None
+            with self.serial_lock:
+                for gaz_id in range(1, 5):
+                    try:
                         mfc.Select_gaz(gaz_id)
                         raw = mfc.Select_nom(gaz_id)
-                    name = raw.split(b"\x00")[0].decode("ascii", errors="ignore")
+                    except Exception:
+                        continue
+                    # find + slice : pas de liste intermédiaire comme split()
+                    n = raw.find(b"\x00")
+                    name = (raw if n < 0 else raw[:n]).decode("ascii", errors="ignore")
                     if name:
                         d.available_gases.append(name)
                         d.gas_map[name] = gaz_id
-                except Exception:
-                    pass
 
-            if d.available_gases:
-                first = d.available_gases[0]
-                with self.serial_lock:
+                if d.available_gases:
+                    first = d.available_gases[0]
                     mfc.Select_gaz(d.gas_map[first])
-                d.selected_gas = d.gas_map[first]
+                    d.selected_gas = d.gas_map[first]
+                    d.default_gas_id = d.selected_gas
 
-            with self.serial_lock:
                 mfc.write_totalizer_control(1)
 
             # ramp (par défaut OFF)
@@ -156,17 +338,17 @@ class MassiqueManager:
             # vanne régulation par défaut + consigne 0
             self.set_vanne(idx, "Régulation")
             self.send_consigne(idx, 0.0)
+            self._sync_snapshot(idx)
 
         except Exception as e:
-            d.active = False
+            self.active[idx] = 0
             self._mfc_objs[idx] = None
             log.exception("Erreur activation device %s: %s", idx + 1, e)
             raise
 
     def deactivate(self, idx: int) -> None:
-        d = self._get(idx)
         mfc = self._mfc_objs[idx]
-        if d.active and mfc:
+        if self.active[idx] and mfc:
             try:
                 self.send_consigne(idx, 0.0)
                 time.sleep(0.2)
@@ -174,18 +356,20 @@ class MassiqueManager:
                     mfc.write_ramp_control(0)
             except Exception:
                 pass
-        d.active = False
+        self.active[idx] = 0
         self._mfc_objs[idx] = None
-        self._reset_data(d)
+        self._reset_data(idx)
+        self._sync_snapshot(idx)
 
     # ---------- Commands ----------
     def set_tag(self, idx: int, tag: str) -> None:
         d = self._get(idx)
         d.tag = str(tag)[:8].ljust(8, "_")
+        self._sync_snapshot(idx)
         # si actif, il faudrait ré-instancier le mfc (simple: désactiver/activer)
         # on laisse l’UI gérer (OFF puis ON)
 
-    def send_consigne(self, idx: int, consigne: float) -> None:
+    def send_consigne(self, idx: int, consigne: float, now: Optional[float] = None) -> None:
         d = self._get(idx)
         mfc = self._need_mfc(idx)
 
@@ -196,39 +380,41 @@ class MassiqueManager:
             return
         if c < 0:
             c = 0.0
-        if d.full_scale_value and c > d.full_scale_value:
-            c = d.full_scale_value
+        fs = self.full_scale[idx]
+        if fs and c > fs:
+            c = fs
 
-        d.consigne = c
+        self.consigne[idx] = c
 
-        if not d.full_scale_value:
+        if not fs:
             # on tentera au prochain poll (quand FS connu)
             return
 
-        perc = (d.consigne / d.full_scale_value) * 100.0
+        perc = (c / fs) * 100.0
         with self.serial_lock:
             mfc.write_setpoint(perc, units=57)
 
-        now = datetime.datetime.now()
-        d.consigne_points = (d.consigne_points + [(d.consigne, now)])[-3600:]
+        d.consigne_points.append(c, now if now is not None else time.monotonic())
+        self._sync_snapshot(idx)
 
     def set_vanne(self, idx: int, action: str) -> None:
         d = self._get(idx)
         mfc = self._need_mfc(idx)
 
-        cmd = {"Ouverture": 1, "Fermeture": 2, "Régulation": 0}.get(action)
+        cmd = _VANNE_ACTIONS.get(action)
         if cmd is None:
             return
         with self.serial_lock:
             mfc.set_vanne(cmd)
             d.valve_command = mfc.red_vanne() or "N/A"
+        self._sync_snapshot(idx)
 
     def reset_totalization(self, idx: int) -> None:
-        d = self._get(idx)
         mfc = self._need_mfc(idx)
         with self.serial_lock:
             mfc.write_totalizer_control(2)
-        d.totalization_value = (0, d.totalization_value[1] if d.totalization_value else "N/A")
+        self.total_val[idx] = 0.0
+        self._sync_snapshot(idx)
 
     def apply_ramp_settings(self, idx: int, ramp_active: bool, ramp_time_s: float) -> None:
         d = self._get(idx)
@@ -248,6 +434,7 @@ class MassiqueManager:
             else:
                 mfc.write_ramp_control(4)  # linear up/down
                 mfc.write_linear_ramp_value(d.ramp_time_s)
+        self._sync_snapshot(idx)
 
     def select_gas(self, idx: int, gas_name: str) -> None:
         d = self._get(idx)
@@ -259,96 +446,191 @@ class MassiqueManager:
         with self.serial_lock:
             mfc.Select_gaz(gaz_id)
         d.selected_gas = gaz_id
+        self._sync_snapshot(idx)
 
     # ---------- Polling ----------
     def _start_polling(self) -> None:
         if self._poll_thread and self._poll_thread.is_alive():
             return
-        self._poll_stop.clear()
+        self._poll_stop_flag = False
+        self._poll_wake.clear()
         self._poll_thread = threading.Thread(target=self._poll_loop, daemon=True)
         self._poll_thread.start()
 
     def _stop_polling(self) -> None:
-        self._poll_stop.set()
+        self._poll_stop_flag = True
+        self._poll_wake.set()
         if self._poll_thread and self._poll_thread.is_alive():
             self._poll_thread.join(timeout=1.0)
 
+    POLL_PERIOD_S = 1.0
+    READ_RETRIES = 2
+
     def _poll_loop(self) -> None:
-        while not self._poll_stop.is_set():
+        period = self.POLL_PERIOD_S
+        start = time.monotonic()
+        # échéances déphasées pour répartir les accès bus sur la période
+        for i, d in enumerate(self.devices):
+            d.next_poll_at = start + i * (period / self.max_devices)
+
+        while not self._poll_stop_flag:
+            now = time.monotonic()
             for i in range(self.max_devices):
                 d = self.devices[i]
-                if not d.active:
+                if not self.active[i] or now < d.next_poll_at:
                     continue
                 try:
-                    self._poll_one(i)
+                    self._poll_one(i, now)
                 except Exception:
-                    self._reset_data(d)
-            time.sleep(1.0)
-
-    def _poll_one(self, idx: int) -> None:
+                    self._reset_data(i)
+                d.next_poll_at += period
+                now = time.monotonic()
+                if now >= d.next_poll_at:
+                    # le poll a dépassé la période : on resynchronise sans rafale
+                    d.next_poll_at = now
+
+            deadlines = [d.next_poll_at for d in self.devices if self.active[d.index]]
+            remaining = (min(deadlines) - time.monotonic()) if deadlines else period
+            # wait() (et non sleep) pour que disconnect() réveille immédiatement
+            if self._poll_wake.wait(timeout=max(0.0, remaining)):
+                break
+
+    def _poll_one(self, idx: int, now: Optional[float] = None) -> None:
         d = self._get(idx)
         mfc = self._need_mfc(idx)
 
         if d.selected_gas is None:
-            # si pas défini, on tente un défaut
-            if d.available_gases:
-                d.selected_gas = d.gas_map.get(d.available_gases[0])
+            # défaut mémorisé à l'activation (pas de lookup gas_map ici)
+            d.selected_gas = d.default_gas_id
             if d.selected_gas is None:
                 return
 
         g = d.selected_gas
-        with self.serial_lock:
-            fr = mfc.read_flow_rate(g) or (0, "N/A")
-            tmp = mfc.read_dynamic() or (0, "N/A")
-            fs = mfc.read_full_scale_flow_rate(g) or (0, "N/A")
-            tot = mfc.read_totalizer_value() or (0, "N/A")
-            valve = mfc.red_vanne() or "N/A"
-
-        d.mesure = (fr[0], fr[1])
-        d.temperature = (tmp[0], tmp[1])
-        d.full_scale_value = float(fs[0] or 0)
-        d.full_scale = (fs[0], fs[1])
-        d.totalization_value = (tot[0], tot[1])
-        d.valve_command = valve
-
-        now = datetime.datetime.now()
+        for attempt in range(self.READ_RETRIES + 1):
+            try:
+                with self.serial_lock:
+                    if d.has_bulk_read:
+                        # une seule transaction bus pour les 5 paramètres
+                        fr, tmp, fs, tot, valve = mfc.read_bulk(g)
+                    else:
+                        fr = mfc.read_flow_rate(g)
+                        tmp = mfc.read_dynamic()
+                        fs = mfc.read_full_scale_flow_rate(g)
+                        tot = mfc.read_totalizer_value()
+                        valve = mfc.red_vanne()
+                break
+            except serial.SerialException:
+                if attempt == self.READ_RETRIES:
+                    # échec répété : on laisse _poll_loop réinitialiser le device
+                    raise
+        fr = fr or (0, "N/A")
+        tmp = tmp or (0, "N/A")
+        fs = fs or (0, "N/A")
+        tot = tot or (0, "N/A")
+        valve = valve or "N/A"
+
+        # indexations hors de la fenêtre seq : une réponse malformée du
+        # driver doit remonter à _poll_loop avec un seq resté pair
+        mv = _as_float(fr[0])
+        mesure_unit = fr[1]
+        temperature_val = _as_float(tmp[0])
+        temperature_unit = tmp[1]
+        full_scale_val = _as_float(fs[0])
+        full_scale_unit = fs[1]
+        total_val = _as_float(tot[0])
+        total_unit = tot[1]
+
+        d.seq += 1  # impair : écriture en cours
         try:
-            mv = float(d.mesure[0])
-        except Exception:
-            mv = 0.0
-
-        d.measurements = (d.measurements + [(mv, now)])[-3600:]
-        d.consigne_points = (d.consigne_points + [(float(d.consigne), now)])[-3600:]
+            self.mesure_val[idx] = mv
+            d.mesure_unit = mesure_unit
+            self.temperature_val[idx] = temperature_val
+            d.temperature_unit = temperature_unit
+            self.full_scale[idx] = full_scale_val
+            d.full_scale_unit = full_scale_unit
+            self.total_val[idx] = total_val
+            d.total_unit = total_unit
+            d.valve_command = valve
+        finally:
+            d.seq += 1  # pair : état stable, même en cas d'exception
+
+        # horodatage pris une fois par passe dans _poll_loop (pas par device)
+        if now is None:
+            now = time.monotonic()
+        d.measurements.append(mv, now)
+        d.consigne_points.append(self.consigne[idx], now)
+
+        self._sync_snapshot(idx)
 
         # si on a appris FS juste maintenant, on peut pousser la consigne %
-        if d.full_scale_value and d.consigne:
+        if self.full_scale[idx] and self.consigne[idx]:
             # renvoie la consigne (en %) à partir de la valeur
             try:
-                self.send_consigne(idx, d.consigne)
+                self.send_consigne(idx, self.consigne[idx], now)
             except Exception:
                 pass
 
+    def _sync_snapshot(self, idx: int) -> None:
+        """
+        Recopie les champs chauds du device idx dans le snapshot cache.
+        Lecture via seqlock : on relit si le poll a écrit entre-temps.
+        """
+        d = self.devices[idx]
+        e = self._snapshot["devices"][idx]
+        while True:
+            s1 = d.seq
+            if s1 & 1:
+                time.sleep(0)  # écriture en cours, on laisse la main
+                continue
+            e["tag"] = d.tag
+            e["active"] = bool(self.active[idx])
+            e["consigne"] = self.consigne[idx]
+            e["full_scale_value"] = self.full_scale[idx]
+            e["mesure"]["value"] = self.mesure_val[idx]
+            e["mesure"]["unit"] = d.mesure_unit
+            e["total"]["value"] = self.total_val[idx]
+            e["total"]["unit"] = d.total_unit
+            e["valve"] = d.valve_command
+            e["ramp"]["active"] = d.ramp_active
+            e["ramp"]["time_s"] = d.ramp_time_s
+            e["selected_gas"] = d.selected_gas
+            if d.seq == s1:
+                break
+        self._snapshot["version"] += 1
+
+        # miroir numérique dans la mémoire partagée, version en dernier
+        v = self._shm_view
+        n = self.max_devices
+        v[idx] = float(self.active[idx])
+        v[n + idx] = self.consigne[idx]
+        v[2 * n + idx] = self.full_scale[idx]
+        v[3 * n + idx] = self.mesure_val[idx]
+        v[4 * n + idx] = self.temperature_val[idx]
+        v[5 * n + idx] = self.total_val[idx]
+        v[6 * n] = float(self._snapshot["version"])
+
     def snapshot(self) -> Dict[str, Any]:
+        self._snapshot["connected"] = bool(self.serial_port and self.serial_port.is_open)
+        return self._snapshot
+
+    def shm_info(self) -> Dict[str, Any]:
         return {
-            "connected": bool(self.serial_port and self.serial_port.is_open),
-            "devices": [
-                {
-                    "index": d.index,
-                    "tag": d.tag,
-                    "active": d.active,
-                    "consigne": d.consigne,
-                    "full_scale_value": d.full_scale_value,
-                    "mesure": {"value": d.mesure[0], "unit": d.mesure[1]},
-                    "total": {"value": d.totalization_value[0], "unit": d.totalization_value[1]},
-                    "valve": d.valve_command,
-                    "ramp": {"active": d.ramp_active, "time_s": d.ramp_time_s},
-                    "gases": d.available_gases,
-                    "selected_gas": d.selected_gas,
-                }
-                for d in self.devices
-            ],
+            "name": self._shm.name,
+            "metrics": list(self.SHM_METRICS),
+            "max": self.max_devices,
+            "dtype": "float64",
         }
 
+    def close(self) -> None:
+        """Libère le port série et la mémoire partagée (fin d'application)."""
+        self.disconnect()
+        try:
+            self._shm_view.release()
+            self._shm.close()
+            self._shm.unlink()
+        except Exception:
+            pass
+
     # ---------- helpers ----------
     def _get(self, idx: int) -> DeviceState:
         if not (0 <= idx < self.max_devices):
@@ -356,17 +638,23 @@ class MassiqueManager:
         return self.devices[idx]
 
     def _need_mfc(self, idx: int):
-        d = self._get(idx)
+        self._get(idx)
         mfc = self._mfc_objs[idx]
-        if not d.active or mfc is None:
+        if not self.active[idx] or mfc is None:
             raise RuntimeError("Device OFF")
         return mfc
 
-    def _reset_data(self, d: DeviceState) -> None:
-        d.mesure = (0, "N/A")
-        d.temperature = (0, "N/A")
-        d.full_scale = (0, "N/A")
+    def _reset_data(self, idx: int) -> None:
+        d = self.devices[idx]
+        self.mesure_val[idx] = 0.0
+        self.temperature_val[idx] = 0.0
+        self.full_scale[idx] = 0.0
+        self.total_val[idx] = 0.0
+        d.mesure_unit = "N/A"
+        d.temperature_unit = "N/A"
+        d.full_scale_unit = "N/A"
+        d.total_unit = "N/A"
         d.valve_command = "N/A"
         d.measurements.clear()
         d.consigne_points.clear()
-        d.totalization_value = (0, "N/A")
+        self._sync_snapshot(idx)
@@ -8,10 +8,31 @@ APP_NAME = "SI12"
 APP_VERSION = "SI12v1"
 MAX_MASSIQUES = 12
 
+# tags par défaut figés à l'import : jamais reformatés ensuite
+DEFAULT_TAGS = tuple(f"MFC{i+1:05d}"[:8].ljust(8, "_") for i in range(MAX_MASSIQUES))
+
 CONFIG_DIR = r"C:\tag_massique"
 CONFIG_FILE = os.path.join(CONFIG_DIR, "settings.json")
 TAGS_FILE = os.path.join(CONFIG_DIR, "tags_config.json")
 
+# orjson si dispo (3-5x plus rapide), sinon json stdlib
+try:
+    import orjson
+
+    def _dumps(data: Dict[str, Any]) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+    def _loads(raw: bytes) -> Dict[str, Any]:
+        return orjson.loads(raw)
+
+except ImportError:
+
+    def _dumps(data: Dict[str, Any]) -> bytes:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+    def _loads(raw: bytes) -> Dict[str, Any]:
+        return json.loads(raw)
+
 
 def ensure_dir() -> None:
     os.makedirs(CONFIG_DIR, exist_ok=True)
@@ -22,17 +43,20 @@ def load_json(path: str, default: Dict[str, Any] | None = None) -> Dict[str, Any
     if not os.path.exists(path):
         return default or {}
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            return _loads(f.read())
     except Exception:
         return default or {}
 
 
 def save_json(path: str, data: Dict[str, Any]) -> None:
     ensure_dir()
+    # écriture atomique : temp + rename, pas de fichier corrompu si crash
+    tmp = path + ".tmp"
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(tmp, "wb") as f:
+            f.write(_dumps(data))
+        os.replace(tmp, path)
     except Exception:
         pass
 
@@ -55,7 +79,7 @@ def load_tags() -> list[str]:
         return [str(t)[:8].ljust(8, "_") for t in tags]
 
     # défaut
-    return [f"MFC{i+1:05d}"[:8].ljust(8, "_") for i in range(MAX_MASSIQUES)]
+    return list(DEFAULT_TAGS)
 
 
 def save_tags(tags: list[str]) -> None: